@@ -1,8 +1,12 @@
-from base import Solution
+import re
+
+from base import Solution, np
 
 
 class Day01a(Solution):
 
+  STREAM = True
+
   def solve(self, lines):
 
     return sum(self.decode(line) for line in lines)
@@ -23,3 +27,49 @@ class Day01a(Solution):
     for c in line:
       if c.isdigit():
         return c
+
+
+class Day01a_bytes(Day01a):
+
+  BYTES = True
+
+  DIGITS = re.compile(rb'\D*(\d)(?:.*(\d))?')
+
+  def solve_bytes(self, buffer):
+
+    (match, data) = (self.DIGITS.match, buffer.data)
+
+    total = 0
+    for (start, end) in zip(buffer.starts, buffer.ends):
+      (first, last) = match(data, start, end).groups()
+      total += 10 * first[0] + (last or first)[0] - 11 * 48
+
+    return total
+
+
+class Day01a_batch(Day01a):
+
+  BYTES = True
+  NUMPY = True
+
+  def solve_bytes(self, buffer):
+
+    data = np.frombuffer(buffer.data, np.uint8)
+    starts = np.frombuffer(buffer.starts, np.uint64).astype(np.intp)
+    ends = np.frombuffer(buffer.ends, np.uint64).astype(np.intp)
+    if not len(starts):
+      return 0
+
+    digits = np.flatnonzero(data - ord('0') < 10)
+    first = np.searchsorted(digits, starts)
+    last = np.searchsorted(digits, ends) - 1
+    if (missing := np.flatnonzero(first > last)).size:
+      (start, end) = (starts[missing[0]], ends[missing[0]])
+      line = bytes(buffer.data[start:end]).decode()
+      raise RuntimeError(f'no number found in "{line}"')
+
+    return int(
+      10 * data[digits[first]].sum(dtype=np.int64)
+      + data[digits[last]].sum(dtype=np.int64)
+      - 11 * ord('0') * len(starts)
+    )
@@ -5,7 +5,7 @@
 # 1000.txt | 0.018800 | 180.659451   | 1.354501
 
 
-from collections import defaultdict
+from collections import defaultdict, deque
 
 from a.solution.jahschwa import Day01a
 
@@ -46,3 +46,71 @@ class Day01b(Day01a):
           return num
 
     raise RuntimeError('no number found in "{}"'.format(''.join(line)))
+
+
+class Day01b_automaton(Day01b):
+
+  def __init__(self):
+
+    patterns = {str(num): str(num) for num in range(1, 10)}
+    patterns.update(
+      (word, str(idx + 1)) for (idx, word) in enumerate(self.WORDS)
+    )
+    self.forward = Automaton(patterns)
+    self.backward = Automaton({
+      pattern[::-1]: num for (pattern, num) in patterns.items()
+    })
+
+  def first_num(self, line, reverse=False):
+
+    if reverse:
+      num = self.backward.first(reversed(line))
+    else:
+      num = self.forward.first(line)
+
+    if num is None:
+      raise RuntimeError(f'no number found in "{line}"')
+    return num
+
+
+class Automaton:
+
+  def __init__(self, patterns):
+
+    self.delta = [{}]
+    self.output = [None]
+    for (pattern, value) in patterns.items():
+      state = 0
+      for char in pattern:
+        if char not in self.delta[state]:
+          self.delta[state][char] = len(self.delta)
+          self.delta.append({})
+          self.output.append(None)
+        state = self.delta[state][char]
+      self.output[state] = value
+
+    alphabet = set(''.join(patterns))
+    fail = [0] * len(self.delta)
+    queue = deque(self.delta[0].values())
+    while queue:
+      state = queue.popleft()
+      trie = self.delta[state]
+      fallback = self.delta[fail[state]]
+      for char in alphabet:
+        if char in trie:
+          child = trie[char]
+          fail[child] = fallback.get(char, 0)
+          self.output[child] = self.output[child] or self.output[fail[child]]
+          queue.append(child)
+        elif char in fallback:
+          trie[char] = fallback[char]
+
+  def first(self, chars):
+
+    (delta, output, state) = (self.delta, self.output, 0)
+    for char in chars:
+      state = delta[state].get(char, 0)
+      if (value := output[state]):
+        return value
+
+    return None
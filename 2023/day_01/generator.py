@@ -0,0 +1,14 @@
+from base import Generator
+
+from a.solution.jahschwa import Day01a
+from b.solution.jahschwa import Day01b
+
+
+class Day01Generator(Generator):
+
+  REFERENCE = {'a': Day01a, 'b': Day01b}
+
+  def lines(self, source, scale):
+
+    for line in source():
+      yield line * scale
@@ -1,11 +1,14 @@
+from array import array
 from collections import defaultdict
 from enum import Enum, auto
 
-from base import Solution
+from base import Solution, np
 
 
 class Day02a(Solution):
 
+  STREAM = True
+
   def __init__(self):
 
     self.cubes = {
@@ -67,3 +70,51 @@ class Game:
       self.min_cubes[color] <= count
       for (color, count) in round.items()
     )
+
+
+class Day02a_columns(Day02a):
+
+  NUMPY = True
+
+  def solve(self, lines):
+
+    games = Games.parse(lines)
+    return int(games.ids[games.possible(self.cubes)].sum())
+
+
+class Games:
+
+  def __init__(self, ids, counts):
+
+    self.ids = ids
+    self.counts = counts
+
+  @classmethod
+  def parse(cls, lines):
+
+    colors = {color.name[0]: idx for (idx, color) in enumerate(Color)}
+    (ids, counts) = (array('q'), array('q'))
+
+    for line in lines:
+      tokens = line.split()
+      best = [0] * len(colors)
+      for (count, color) in zip(tokens[2::2], tokens[3::2]):
+        idx = colors[color[0]]
+        if (count := int(count)) > best[idx]:
+          best[idx] = count
+      ids.append(int(tokens[1][:-1]))
+      counts.extend(best)
+
+    return cls(
+      np.frombuffer(ids, np.int64),
+      np.frombuffer(counts, np.int64).reshape(-1, len(colors)).T,
+    )
+
+  def possible(self, cubes):
+
+    limits = np.array([cubes[color] for color in Color], np.int64)
+    return (self.counts <= limits[:, None]).all(axis=0)
+
+  def power(self):
+
+    return self.counts.prod(axis=0)
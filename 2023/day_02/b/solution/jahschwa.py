@@ -1,7 +1,7 @@
 from functools import reduce
 from operator import mul
 
-from a.solution.jahschwa import Day02a, Game
+from a.solution.jahschwa import Day02a, Day02a_columns, Game, Games
 
 
 class Day02b(Day02a):
@@ -16,3 +16,10 @@ class GameB(Game):
   def power(self):
 
     return reduce(mul, self.min_cubes.values())
+
+
+class Day02b_columns(Day02a_columns):
+
+  def solve(self, lines):
+
+    return int(Games.parse(lines).power().sum())
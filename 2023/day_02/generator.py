@@ -0,0 +1,17 @@
+from base import Generator
+
+from a.solution.jahschwa import Day02a
+from b.solution.jahschwa import Day02b
+
+
+class Day02Generator(Generator):
+
+  REFERENCE = {'a': Day02a, 'b': Day02b}
+
+  def lines(self, source, scale):
+
+    id = 0
+    for _ in range(scale):
+      for line in source():
+        id += 1
+        yield f'Game {id}: {line.split(": ", 1)[1]}'
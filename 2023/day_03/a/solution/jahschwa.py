@@ -1,95 +1,121 @@
-from dataclasses import dataclass, field
+from bisect import bisect_left
+from dataclasses import dataclass
+import re
 
-from base import Solution
+from base import Grid, Solution, np
 
 
 class Day03a(Solution):
 
-  def solve(self, lines):
-
-    return sum(part.number for part in Schematic.parse(lines))
-
+  NUMPY = True
 
-@dataclass
-class Part:
+  def solve(self, lines):
 
-  row: int
-  start_col: int
-  end_col: int
-  number: int
+    schematic = Schematic.parse(lines)
+    return int(schematic.numbers[np.unique(schematic.touching())].sum())
 
 
 class Schematic:
 
   IGNORE = '.'
 
-  def __init__(self, parts, symbols):
+  def __init__(self, grid, labels, numbers):
 
-    self.parts = parts
-    self.symbols = symbols
+    self.grid = grid
+    self.labels = labels
+    self.numbers = numbers
 
   @classmethod
   def parse(cls, lines):
 
-    parts = []
-    symbols = {}
-
-    def add_part(row, end_col, num):
-      parts.append(
-        Part(row, end_col - len(num) + 1, end_col, int(num))
-      )
-
-    for (row, line) in enumerate(lines):
-      current = []
-      for (col, c) in enumerate(line):
-        if c.isdigit():
-          current.append(c)
-          continue
-        if c not in Schematic.IGNORE:
-          symbols[(row, col)] = Symbol(row, col, c)
-        if current:
-          add_part(row, col - 1, ''.join(current))
-          current = []
-      if current:
-        add_part(row, col - 1, ''.join(current))
-
-    return cls(parts, symbols)
-
-  def adjacent_symbols(self, part, limit=None, allow=None):
-
-    symbols = {}
-    (left, right) = (part.start_col - 1, part.end_col + 1)
-
-    def add_symbol(row, col):
-      if (
-        (symbol := self.symbols.get((row, col)))
-        and (not allow or symbol.char in allow)
-      ):
-          symbols[(row, col)] = symbol
-
-    for row in (part.row - 1, part.row + 1):
-      for col in range(left, right + 1):
-          add_symbol(row, col)
-          if limit and len(symbols) >= limit:
-            return symbols
-
-    row = part.row
-    for col in (left, right):
-      add_symbol(row, col)
-      if limit and len(symbols) >= limit:
-        return symbols
-
-    return symbols
+    grid = Grid.from_lines(lines, cls.IGNORE)
+    (labels, count) = Grid.label_runs(grid.digits())
 
-  def __iter__(self):
+    return cls(grid, labels, grid.run_values(labels, count))
+
+  def symbols(self, allow=None):
+
+    if allow:
+      return self.grid.isin(allow)
+    return ~(self.grid.digits() | self.grid.isin(self.IGNORE))
+
+  def touching(self, allow=None):
+
+    return self.labels[Grid.dilate(self.symbols(allow)) & (self.labels > 0)]
+
+
+class Day03a_stream(Day03a):
+
+  NUMPY = False
+  STREAM = True
+
+  def solve(self, lines):
+
+    return sum(SchematicStream(lines))
+
+
+@dataclass
+class Row:
 
-    for part in self.parts:
-      if self.adjacent_symbols(part, 1):
-        yield part
+  line: str
+  starts: list[int]
+  ends: list[int]
+  numbers: list[int]
+  symbols: list[int]
 
+  NUMBER = re.compile(r'\d+')
+  SYMBOL = re.compile(r'[^\d.]')
+
+  @classmethod
+  def parse(cls, line):
+
+    (starts, ends, numbers) = ([], [], [])
+    for match in cls.NUMBER.finditer(line):
+      starts.append(match.start())
+      ends.append(match.end() - 1)
+      numbers.append(int(match.group()))
+    symbols = [match.start() for match in cls.SYMBOL.finditer(line)]
+
+    return cls(line, starts, ends, numbers, symbols)
+
+  def has_symbol(self, left, right):
+
+    idx = bisect_left(self.symbols, left)
+    return idx < len(self.symbols) and self.symbols[idx] <= right
+
+  def numbers_near(self, col):
+
+    idx = bisect_left(self.ends, col - 1)
+    while idx < len(self.starts) and self.starts[idx] <= col + 1:
+      yield self.numbers[idx]
+      idx += 1
+
+
+class SchematicStream:
+
+  EMPTY = Row('', [], [], [], [])
+
+  def __init__(self, lines):
+
+    self.lines = lines
+
+  def windows(self):
+
+    (prev, cur) = (self.EMPTY, None)
+    for line in self.lines:
+      row = Row.parse(line)
+      if cur is not None:
+        yield (prev, cur, row)
+        prev = cur
+      cur = row
+
+    if cur is not None:
+      yield (prev, cur, self.EMPTY)
+
+  def __iter__(self):
 
-@dataclass(frozen=True)
-class Symbol:
-  row: int
-  col: int
-  char: str = field(compare=False)
+    for window in self.windows():
+      cur = window[1]
+      for (start, end, number) in zip(cur.starts, cur.ends, cur.numbers):
+        if any(row.has_symbol(start - 1, end + 1) for row in window):
+          yield number
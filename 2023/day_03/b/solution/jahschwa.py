@@ -1,38 +1,54 @@
-from collections import defaultdict
-from dataclasses import dataclass
+from base import Grid, np
 
-from a.solution.jahschwa import Day03a, Part, Schematic
+from a.solution.jahschwa import (
+  Day03a,
+  Day03a_stream,
+  Schematic,
+  SchematicStream,
+)
 
 
 class Day03b(Day03a):
 
   def solve(self, lines):
 
-    return sum(gear.ratio() for gear in SchematicB.parse(lines))
+    return int(SchematicB.parse(lines).ratios().sum())
 
 
 class SchematicB(Schematic):
 
   GEAR = '*'
 
-  def __iter__(self):
+  def ratios(self):
+
+    near = np.sort(
+      Grid.neighbourhood(self.labels, self.symbols(self.GEAR)), axis=1
+    )
+    distinct = (near > 0) & np.diff(near, axis=1, prepend=0).astype(bool)
+    gears = distinct.sum(axis=1) == 2
+
+    parts = near[gears][distinct[gears]].reshape(-1, 2)
+    return self.numbers[parts[:, 0]] * self.numbers[parts[:, 1]]
+
 
-    parts_near_gears = defaultdict(lambda: [])
-    for part in self.parts:
-      for symbol in self.adjacent_symbols(part, None, SchematicB.GEAR):
-        parts_near_gears[symbol].append(part)
+class Day03b_stream(Day03a_stream):
 
-    for parts in parts_near_gears.values():
-      if len(parts) == 2:
-        yield Gear(*parts)
+  def solve(self, lines):
+
+    return sum(SchematicStreamB(lines))
 
 
-@dataclass
-class Gear:
+class SchematicStreamB(SchematicStream):
 
-  part1: Part
-  part2: Part
+  GEAR = '*'
 
-  def ratio(self):
+  def __iter__(self):
 
-    return self.part1.number * self.part2.number
+    for window in self.windows():
+      cur = window[1]
+      for col in cur.symbols:
+        if cur.line[col] != self.GEAR:
+          continue
+        near = [number for row in window for number in row.numbers_near(col)]
+        if len(near) == 2:
+          yield near[0] * near[1]
@@ -0,0 +1,14 @@
+from base import Generator
+
+from a.solution.jahschwa import Day03a_stream
+from b.solution.jahschwa import Day03b_stream
+
+
+class Day03Generator(Generator):
+
+  REFERENCE = {'a': Day03a_stream, 'b': Day03b_stream}
+
+  def lines(self, source, scale):
+
+    for _ in range(scale):
+      yield from source()
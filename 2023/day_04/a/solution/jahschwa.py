@@ -1,10 +1,14 @@
 from dataclasses import dataclass
+from functools import reduce
+from operator import or_
 
 from base import Solution
 
 
 class Day04a(Solution):
 
+  STREAM = True
+
   def solve(self, lines):
 
     return sum(Card.parse(line).points() for line in lines)
@@ -34,3 +38,34 @@ class Card:
 
     matches = self.matches()
     return 2 ** (matches - 1) if matches else 0
+
+
+class Day04a_bits(Day04a):
+
+  def solve(self, lines):
+
+    return sum(1 << matches >> 1 for matches in map(BitCard.matches, lines))
+
+
+class Bits(dict):
+
+  def __missing__(self, num):
+
+    self[num] = bit = 1 << int(num)
+    return bit
+
+
+class BitCard:
+
+  BITS = Bits()
+
+  @classmethod
+  def matches(cls, s):
+
+    (nums_win, nums) = s[s.index(':') + 1:].split('|')
+    return (cls.mask(nums_win) & cls.mask(nums)).bit_count()
+
+  @classmethod
+  def mask(cls, s):
+
+    return reduce(or_, map(cls.BITS.__getitem__, s.split()), 0)
@@ -1,6 +1,6 @@
-from collections import defaultdict
+from collections import defaultdict, deque
 
-from a.solution.jahschwa import Card, Day04a
+from a.solution.jahschwa import BitCard, Card, Day04a, Day04a_bits
 
 
 class Day04b(Day04a):
@@ -17,3 +17,20 @@ class Day04b(Day04a):
         cards[copy] += copies
 
     return sum(cards.values())
+
+
+class Day04b_bits(Day04a_bits):
+
+  def solve(self, lines):
+
+    (total, extra, diff) = (0, 0, deque())
+    for matches in map(BitCard.matches, lines):
+      extra += diff.popleft() if diff else 0
+      copies = 1 + extra
+      total += copies
+      if matches:
+        diff.extend((matches + 1 - len(diff)) * [0])
+        diff[0] += copies
+        diff[matches] -= copies
+
+    return total
@@ -0,0 +1,17 @@
+from base import Generator
+
+from a.solution.jahschwa import Day04a
+from b.solution.jahschwa import Day04b
+
+
+class Day04Generator(Generator):
+
+  REFERENCE = {'a': Day04a, 'b': Day04b}
+
+  def lines(self, source, scale):
+
+    id = 0
+    for _ in range(scale):
+      for line in source():
+        id += 1
+        yield f'Card {id}: {line.split(": ", 1)[1]}'
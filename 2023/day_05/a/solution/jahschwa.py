@@ -1,7 +1,9 @@
+from bisect import bisect_right
 from dataclasses import dataclass
-from functools import total_ordering
+from functools import cached_property, total_ordering
+from math import inf
 
-from base import Solution
+from base import Solution, np
 
 
 class Day05a(Solution):
@@ -9,12 +11,19 @@ class Day05a(Solution):
   def solve(self, lines):
 
     (seed_to_location, _) = Almanac.parse(lines).resolve()
-    import json; print(json.dumps(seed_to_location, indent=4))
-    for nums in (seed_to_location.keys(), seed_to_location.values()):
-      print(' '.join(str(num).zfill(2) for num in nums))
     return min(seed_to_location.values())
 
 
+class Day05a_batch(Day05a):
+
+  NUMPY = True
+
+  def solve(self, lines):
+
+    (locations, _) = Almanac.parse(lines).resolve(batch=True)
+    return int(locations.min())
+
+
 @total_ordering
 @dataclass
 class Entry:
@@ -50,6 +59,66 @@ class Entry:
     return self.src_start < other
 
 
+@dataclass
+class IntervalMap:
+
+  starts: list[int]
+  offsets: list[int]
+
+  @classmethod
+  def identity(cls):
+
+    return cls([0], [0])
+
+  @classmethod
+  def from_entries(cls, entries):
+
+    (starts, offsets, pos) = ([], [], 0)
+    for entry in entries:
+      if entry.src_start > pos:
+        cls._add(starts, offsets, pos, 0)
+      offset = entry.dst_start - entry.src_start
+      cls._add(starts, offsets, entry.src_start, offset)
+      pos = entry.src_start + entry.length
+    cls._add(starts, offsets, pos, 0)
+
+    return cls(starts, offsets)
+
+  def compose(self, other):
+
+    (starts, offsets) = ([], [])
+    for (start, end, offset) in self.pieces(0, inf):
+      for (lo, _, extra) in other.pieces(start + offset, end + offset):
+        self._add(starts, offsets, lo - offset, offset + extra)
+
+    return IntervalMap(starts, offsets)
+
+  def pieces(self, lo, hi):
+
+    idx = bisect_right(self.starts, lo) - 1
+    while lo < hi:
+      end = self.starts[idx + 1] if idx + 1 < len(self.starts) else inf
+      yield (lo, min(hi, end), self.offsets[idx])
+      (lo, idx) = (end, idx + 1)
+
+  def push(self, ranges):
+
+    for (lo, hi) in ranges:
+      for (start, end, offset) in self.pieces(lo, hi):
+        yield (start + offset, end + offset)
+
+  def __getitem__(self, num):
+
+    return num + self.offsets[bisect_right(self.starts, num) - 1]
+
+  @staticmethod
+  def _add(starts, offsets, start, offset):
+
+    if not offsets or offsets[-1] != offset:
+      starts.append(start)
+      offsets.append(offset)
+
+
 @dataclass
 class Map:
 
@@ -65,6 +134,29 @@ class Map:
 
     return cls(src, dst, ranges)
 
+  @cached_property
+  def _arrays(self) -> tuple:
+
+    return tuple(
+      np.array([getattr(entry, name) for entry in self.ranges], np.int64)
+      for name in ('src_start', 'dst_start', 'length')
+    )
+
+  def lookup(self, nums):
+
+    (starts, dsts, lengths) = self._arrays
+
+    idx = np.searchsorted(starts, nums, 'right') - 1
+    hit = (idx >= 0) & (nums < (starts + lengths)[idx])
+    result = nums.copy()
+    result[hit] += (dsts - starts)[idx[hit]]
+
+    return result
+
+  def intervals(self):
+
+    return IntervalMap.from_entries(self.ranges)
+
   def __getitem__(self, num):
 
     (left, right) = (0, len(self.ranges))
@@ -107,7 +199,10 @@ class Almanac:
 
     return Almanac(seeds, maps)
 
-  def resolve(self):
+  def resolve(self, batch=False):
+
+    if batch:
+      return self._resolve_batch()
 
     result = {}
 
@@ -120,3 +215,20 @@ class Almanac:
       result[seed] = cur_id
 
     return (result, cur_name)
+
+  def _resolve_batch(self):
+
+    (cur_name, cur_ids) = (self.START, np.array(self.seeds, np.int64))
+    while (next_map := self.maps.get(cur_name)):
+      (cur_name, cur_ids) = (next_map.destination, next_map.lookup(cur_ids))
+
+    return (cur_ids, cur_name)
+
+  def compose(self):
+
+    (cur_name, composed) = (self.START, IntervalMap.identity())
+    while (next_map := self.maps.get(cur_name)):
+      composed = composed.compose(next_map.intervals())
+      cur_name = next_map.destination
+
+    return (composed, cur_name)
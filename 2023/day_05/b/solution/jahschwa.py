@@ -0,0 +1,17 @@
+from a.solution.jahschwa import Almanac, Day05a
+
+
+class Day05b(Day05a):
+
+  def solve(self, lines):
+
+    almanac = Almanac.parse(lines)
+    (composed, _) = almanac.compose()
+
+    seeds = almanac.seeds
+    ranges = [
+      (start, start + length)
+      for (start, length) in zip(seeds[::2], seeds[1::2])
+    ]
+
+    return min(lo for (lo, _) in composed.push(ranges))
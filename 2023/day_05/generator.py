@@ -0,0 +1,16 @@
+from base import Generator
+
+from a.solution.jahschwa import Day05a
+from b.solution.jahschwa import Day05b
+
+
+class Day05Generator(Generator):
+
+  REFERENCE = {'a': Day05a, 'b': Day05b}
+
+  def lines(self, source, scale):
+
+    lines = source()
+    (label, seeds) = next(lines).split(': ', 1)
+    yield f'{label}: {" ".join(scale * [seeds])}'
+    yield from lines
@@ -1,9 +1,17 @@
-from dataclasses import dataclass, field
+import cProfile
+from dataclasses import dataclass
+from enum import Enum, auto
 from math import floor, log
+from pathlib import Path
+import pstats
+import shutil
+from statistics import fmean, median, quantiles, stdev
 import time
 from traceback import format_exc
+import tracemalloc
+from typing import Callable, Iterator
 
-from puzzle_input import PuzzleInput
+from puzzle_input import InputBuffer, PuzzleInput, np
 
 
 RED = '\033[91m'
@@ -15,25 +23,47 @@ YELLOW = '\033[93m'
 @dataclass
 class Duration:
 
-  start: float
+  samples: list[int]
 
-  stop: float = field(default_factory=time.time)
   precision: int = 4
   width: int = 12
+  reject_outliers: bool = True
 
   elapsed: float = None
+  best: float = None
+  mean: float = None
+  median: float = None
+  stdev: float = None
+  iqr: float = None
+  outliers: int = 0
 
   _color: str = None
   _factor: int = None
   _scaled: float = None
   _unit: float = None
 
+  NS = 1_000_000_000
 
   def __post_init__(self):
 
-    self.elapsed = self.stop - self.start
+    samples = sorted(self.samples)
+    self.iqr = 0.0
+    if len(samples) > 1:
+      (q1, _, q3) = quantiles(samples, n=4)
+      self.iqr = (q3 - q1) / self.NS
+      if self.reject_outliers and len(samples) >= 4:
+        fence = 1.5 * (q3 - q1)
+        kept = [s for s in samples if q1 - fence <= s <= q3 + fence]
+        self.outliers = len(samples) - len(kept)
+        samples = kept
 
-    power = floor(log(self.elapsed, 1000))
+    self.best = samples[0] / self.NS
+    self.mean = fmean(samples) / self.NS
+    self.median = median(samples) / self.NS
+    self.stdev = stdev(samples) / self.NS if len(samples) > 1 else 0.0
+    self.elapsed = self.median
+
+    power = min(0, max(-2, floor(log(max(self.elapsed, 1e-9), 1000))))
     self._factor = 1000 ** power
     self._scaled = self.elapsed / self._factor
 
@@ -42,29 +72,174 @@ class Duration:
 
     self._color = [RED, YELLOW, GREEN][-power]
 
-  def __str__(self):
+  def stats(self):
+
+    fmt = '{:.%sf}' % self.precision
+    scale = lambda seconds: fmt.format(seconds / self._factor)
+
+    text = 'min {} mean {} ± {} iqr {} {} n={}'.format(
+      scale(self.best),
+      scale(self.mean),
+      scale(self.stdev),
+      scale(self.iqr),
+      self._unit.strip(),
+      len(self.samples),
+    )
+    if self.outliers:
+      text += f' ({self.outliers} rejected)'
+
+    return text
+
+  def to_str(self, color=True):
 
     return ('{}{:>8.%sf} {:<3}{}' % self.precision).format(
-      self._color, self._scaled, self._unit, RESET
+      self._color if color else '',
+      self._scaled,
+      self._unit,
+      RESET if color else '',
+    )
+
+  def __str__(self):
+
+    return self.to_str()
+
+
+@dataclass
+class Memory:
+
+  peak: int
+  net: int
+  top: list[tuple[str, int]]
+
+  @staticmethod
+  def to_str_bytes(num: int) -> str:
+
+    for unit in ('B', 'KiB', 'MiB'):
+      if abs(num) < 1024:
+        break
+      num /= 1024
+    else:
+      unit = 'GiB'
+
+    return f'{num:>7.1f} {unit:<3}'
+
+  def __str__(self):
+
+    return 'peak {} net {}'.format(
+      self.to_str_bytes(self.peak), self.to_str_bytes(self.net)
     )
 
 
+@dataclass
+class Profile:
+
+  stats: dict
+  top: list[tuple[str, float, float]]
+  collapsed: list[str]
+
+  MAX_STACKS = 10_000
+  MIN_STACK = 0.5e-6
+
+  @classmethod
+  def from_profiler(cls, profiler: cProfile.Profile, limit: int) -> 'Profile':
+
+    stats = pstats.Stats(profiler).stats
+
+    top = sorted(
+      (
+        (cls.to_str_func(func), cumtime, tottime)
+        for (func, (_, _, tottime, cumtime, _)) in stats.items()
+      ),
+      key=lambda entry: entry[1],
+      reverse=True,
+    )
+
+    return cls(stats, top[:limit], cls._collapse(stats))
+
+  @staticmethod
+  def to_str_func(func: tuple) -> str:
+
+    (filename, lineno, name) = func
+    if filename == '~':
+      return name
+    return f'{Path(filename).name}:{lineno}({name})'
+
+  @classmethod
+  def _collapse(cls, stats: dict) -> list[str]:
+
+    callees = {}
+    for (func, (*_, callers)) in stats.items():
+      for (caller, edge) in callers.items():
+        callees.setdefault(caller, []).append((func, edge[3]))
+
+    stacks = {}
+
+    def walk(func, stack, budget):
+
+      (_, _, tottime, cumtime, _) = stats[func]
+      stack = stack + [cls.to_str_func(func)]
+      share = budget / cumtime if cumtime else 0
+      key = ';'.join(stack)
+      stacks[key] = stacks.get(key, 0) + tottime * share
+      for (callee, edge_cumtime) in callees.get(func, []):
+        child = edge_cumtime * share
+        if child < cls.MIN_STACK or cls.to_str_func(callee) in stack:
+          continue
+        if len(stacks) < cls.MAX_STACKS:
+          walk(callee, stack, child)
+        else:
+          stacks[key] += child
+
+    for (func, (*_, callers)) in stats.items():
+      if not callers:
+        walk(func, [], stats[func][3])
+
+    return [
+      f'{stack} {round(seconds * 1_000_000)}'
+      for (stack, seconds) in stacks.items()
+      if round(seconds * 1_000_000)
+    ]
+
+
+class State(Enum):
+
+  OK = auto()
+  ERROR = auto()
+  TIMEOUT = auto()
+  OOM = auto()
+
+
 @dataclass
 class Result:
 
   elapsed: Duration
   expected: int
   input_name: str
-  observed: int | str
+  observed: int | str | None
+  state: State = State.OK
+  memory: Memory | None = None
+  profile: Profile | None = None
+  load: Duration | None = None
+  parse: Duration | None = None
+  cached: bool = False
   correct: None = None
 
   def __post_init__(self):
 
-    self.correct = self.observed == self.expected
+    if self.state is State.OK and isinstance(self.observed, str):
+      self.state = State.ERROR
+    self.correct = self.state is State.OK and self.observed == self.expected
 
 
 class Solution:
 
+  BYTES = False
+  MEMORY_SITES = 3
+  NUMPY = False
+  OFFSETS = True
+  PROFILE_TOP = 5
+  STREAM = False
+
   def parse(self, line: str) -> str:
 
     return line
@@ -73,19 +248,253 @@ class Solution:
 
     raise NotImplementedError
 
-  def _solve(self, puzzle_input: PuzzleInput) -> Result:
+  def solve_bytes(self, buffer: InputBuffer) -> int:
+
+    raise NotImplementedError
+
+  def _solve(
+    self,
+    puzzle_input: PuzzleInput,
+    repeat: int = 1,
+    warmup: int = 0,
+    memory: bool = False,
+    profile: bool = False,
+  ) -> Result:
+
+    solve = self.solve
+    if self.BYTES:
+      start = time.perf_counter_ns()
+      buffer = puzzle_input.buffer()
+      if self.OFFSETS:
+        buffer.starts
+      parse = Duration([time.perf_counter_ns() - start])
+      (solve, read) = (self.solve_bytes, lambda: buffer)
+    elif self.STREAM and puzzle_input.lines is None:
+      read = lambda: map(self.parse, puzzle_input.iter_lines())
+      parse = None
+    else:
+      start = time.perf_counter_ns()
+      lines = [self.parse(line) for line in puzzle_input.iter_lines()]
+      parse = Duration([time.perf_counter_ns() - start])
+      read = lambda: lines
 
-    lines = [self.parse(line) for line in puzzle_input.lines]
-    start = time.time()
+    samples = []
+    state = State.OK
+    start = time.perf_counter_ns()
     try:
-      observed = self.solve(lines)
+      if self.NUMPY and np is None:
+        raise RuntimeError(f'{type(self).__name__} requires numpy')
+      for _ in range(warmup):
+        solve(read())
+      for _ in range(repeat):
+        lines = read()
+        start = time.perf_counter_ns()
+        observed = solve(lines)
+        samples.append(time.perf_counter_ns() - start)
+    except MemoryError:
+      (observed, state) = (None, State.OOM)
+      samples.append(time.perf_counter_ns() - start)
     except Exception:
       observed = format_exc()
-    end = time.time()
+      samples.append(time.perf_counter_ns() - start)
 
     return Result(
-      elapsed=Duration(start, end),
+      elapsed=Duration(samples),
       expected=puzzle_input.solution,
       input_name=puzzle_input.path.name,
       observed=observed,
+      state=state,
+      memory=(
+        self._trace(solve, read()) if memory and state is State.OK else None
+      ),
+      profile=(
+        self._profile(solve, read()) if profile and state is State.OK else None
+      ),
+      load=Duration([puzzle_input.load_ns]),
+      parse=parse,
+    )
+
+  def _profile(self, solve: Callable, lines: list[str]) -> Profile:
+
+    profiler = cProfile.Profile()
+    profiler.runcall(solve, lines)
+
+    return Profile.from_profiler(profiler, self.PROFILE_TOP)
+
+  def _trace(self, solve: Callable, lines: list[str]) -> Memory:
+
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    own = {
+      lineno
+      for method in (Solution._solve, Solution._trace)
+      for (*_, lineno) in method.__code__.co_lines()
+    }
+
+    tracemalloc.start()
+    try:
+      before = tracemalloc.take_snapshot().filter_traces(ignore)
+      (baseline, _) = tracemalloc.get_traced_memory()
+      tracemalloc.reset_peak()
+      solve(lines)
+      (current, peak) = tracemalloc.get_traced_memory()
+      after = tracemalloc.take_snapshot().filter_traces(ignore)
+    finally:
+      tracemalloc.stop()
+
+    top = [
+      (f'{Path(frame.filename).name}:{frame.lineno}', stat.size_diff)
+      for stat in after.compare_to(before, 'lineno')
+      if stat.size_diff > 0
+      and not ((frame := stat.traceback[0]).filename == __file__
+        and frame.lineno in own)
+    ]
+
+    return Memory(
+      peak=peak - baseline,
+      net=current - baseline,
+      top=top[:self.MEMORY_SITES],
+    )
+
+
+class Generator:
+
+  REFERENCE: dict[str, type[Solution]] = {}
+  SOURCE = 'final.txt'
+  PREFIX = 'x'
+
+  def lines(
+    self, source: Callable[[], Iterator[str]], scale: int
+  ) -> Iterator[str]:
+
+    raise NotImplementedError
+
+  def _generate(self, day_dir: Path, scale: int) -> list[Path]:
+
+    (first, *rest) = sorted(self.REFERENCE)
+    input_dir = day_dir / first / 'input'
+    name = f'{self.PREFIX}{scale}.txt'
+    source = PuzzleInput.parse(input_dir / self.SOURCE, stream=True)
+
+    body = input_dir / f'.{name}.tmp'
+    try:
+      with open(body, 'w') as file:
+        file.write(f'solution = 0\n{79 * PuzzleInput.SEP}\n')
+        file.writelines(
+          f'{line}\n' for line in self.lines(source.iter_lines, scale)
+        )
+
+      generated = PuzzleInput.parse(body, stream=True)
+      solutions = {
+        part: self._reference(reference(), generated)
+        for (part, reference) in self.REFERENCE.items()
+      }
+
+      paths = [input_dir / name]
+      with open(body) as src, open(paths[0], 'w') as dst:
+        src.readline()
+        dst.write(f'solution = {solutions[first]}\n')
+        shutil.copyfileobj(src, dst)
+    finally:
+      body.unlink(missing_ok=True)
+
+    for part in rest:
+      paths.append(day_dir / part / 'input' / name)
+      with open(paths[-1], 'w') as file:
+        file.write(f'base = ../../{first}/input/{name}\n')
+        file.write(f'solution = {solutions[part]}\n')
+
+    return paths
+
+  @staticmethod
+  def _reference(solution: Solution, puzzle_input: PuzzleInput) -> int:
+
+    lines = map(solution.parse, puzzle_input.iter_lines())
+    return solution.solve(lines if solution.STREAM else list(lines))
+
+
+class Grid:
+
+  def __init__(self, cells: 'np.ndarray'):
+
+    self.cells = cells
+
+  @classmethod
+  def from_lines(cls, lines: list[str], fill: str = '.') -> 'Grid':
+
+    width = max(map(len, lines), default=0)
+    data = ''.join(line.ljust(width, fill) for line in lines).encode()
+
+    return cls(np.frombuffer(data, np.uint8).reshape(len(lines), width))
+
+  @property
+  def shape(self) -> tuple[int, int]:
+
+    return self.cells.shape
+
+  def isin(self, chars: str) -> 'np.ndarray':
+
+    return np.isin(self.cells, np.frombuffer(chars.encode(), np.uint8))
+
+  def digits(self) -> 'np.ndarray':
+
+    return (self.cells >= ord('0')) & (self.cells <= ord('9'))
+
+  def run_values(self, labels: 'np.ndarray', count: int) -> 'np.ndarray':
+
+    flat = labels.ravel()
+    idx = np.flatnonzero(flat)
+    values = np.zeros(count + 1, np.int64)
+    if not count:
+      return values
+
+    digits = self.cells.ravel()[idx].astype(np.int64) - ord('0')
+    ids = flat[idx]
+    starts = np.flatnonzero(np.diff(ids, prepend=0))
+    lengths = np.diff(np.append(starts, len(ids)))
+    ends = starts + lengths - 1
+    exponent = np.repeat(ends, lengths) - np.arange(len(ids))
+    values[1:] = np.add.reduceat(digits * 10 ** exponent, starts)
+
+    return values
+
+  @staticmethod
+  def dilate(mask: 'np.ndarray', radius: int = 1) -> 'np.ndarray':
+
+    (rows, cols) = mask.shape
+    padded = np.pad(mask, radius)
+    out = np.zeros_like(mask)
+    for dr in range(2 * radius + 1):
+      for dc in range(2 * radius + 1):
+        out |= padded[dr:dr + rows, dc:dc + cols]
+
+    return out
+
+  @staticmethod
+  def label_runs(mask: 'np.ndarray') -> tuple['np.ndarray', int]:
+
+    (rows, cols) = mask.shape
+    padded = np.zeros((rows, cols + 1), bool)
+    padded[:, :cols] = mask
+    flat = padded.ravel()
+    starts = flat & ~np.concatenate(([False], flat[:-1]))
+    labels = np.cumsum(starts, dtype=np.int64) * flat
+
+    return (labels.reshape(rows, cols + 1)[:, :cols], int(starts.sum()))
+
+  @staticmethod
+  def neighbourhood(
+    array: 'np.ndarray', mask: 'np.ndarray', radius: int = 1
+  ) -> 'np.ndarray':
+
+    (rows, cols) = np.nonzero(mask)
+    padded = np.pad(array, radius)
+    size = 2 * radius + 1
+
+    return np.stack(
+      [
+        padded[rows + dr, cols + dc]
+        for dr in range(size)
+        for dc in range(size)
+      ],
+      axis=1,
     )
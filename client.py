@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+import json
+import os
+from pathlib import Path
+import socket
+import sys
+
+
+def main(argv: list[str]) -> int:
+
+  with socket.socket(socket.AF_UNIX) as sock:
+    try:
+      sock.connect(str(SOCKET_PATH))
+    except OSError:
+      run = str(SOCKET_PATH.parent.parent / 'run.py')
+      os.execv(sys.executable, [sys.executable, run] + argv)
+
+    request = {'argv': argv, 'cwd': os.getcwd()}
+    sock.sendall(json.dumps(request).encode() + b'\n')
+
+    (out, trailer) = (sys.stdout.buffer, None)
+    while (chunk := sock.recv(BUFFER)):
+      if trailer is not None:
+        trailer += chunk
+        continue
+      (chunk, sep, rest) = chunk.partition(b'\0')
+      out.write(chunk)
+      out.flush()
+      if sep:
+        trailer = rest
+
+  return int(trailer or 1)
+
+
+BUFFER = 1 << 16
+SOCKET_PATH = Path(__file__).resolve().parent / '.cache' / 'run.sock'
+
+
+if __name__ == '__main__':
+  sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,233 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from importlib import util as imp
+import multiprocessing as mp
+from multiprocessing.connection import wait
+import os
+from pathlib import Path
+import resource
+import signal
+import sys
+import time
+from typing import Iterator
+
+from base import Duration, Result, State
+from puzzle_input import PuzzleInput
+
+
+@dataclass(frozen=True)
+class Task:
+
+  solution_file: Path
+  class_name: str
+  puzzle_input: PuzzleInput
+
+
+@dataclass
+class Executor:
+
+  cache: 'ResultCache | None' = None
+  force: bool = False
+  isolate: bool = False
+  jobs: int = 1
+  max_memory: int | None = None
+  memory: bool = False
+  profile: bool = False
+  repeat: int = 1
+  timeout: float | None = None
+  warmup: int = 0
+
+  def __post_init__(self):
+
+    self.jobs = self.jobs or os.cpu_count()
+    self.isolate = self.isolate or bool(self.timeout or self.max_memory)
+
+  def run(self, tasks: list[Task]) -> Iterator[tuple[int, Result]]:
+
+    dirty = []
+    for (idx, task) in enumerate(tasks):
+      if (
+        self.cache and not self.force
+        and (result := self.cache.get(task, self.cache_options))
+      ):
+        yield (idx, result)
+      else:
+        dirty.append((idx, task))
+
+    if self.isolate:
+      run = self._run_isolated
+    elif self.jobs > 1:
+      run = self._run_parallel
+    else:
+      run = self._run_serial
+
+    for (dirty_idx, result) in run([task for (_, task) in dirty]):
+      (idx, task) = dirty[dirty_idx]
+      if self.cache and result.state is State.OK:
+        self.cache.put(task, self.cache_options, result)
+      yield (idx, result)
+
+  def _run_serial(self, tasks):
+
+    for (idx, task) in enumerate(tasks):
+      yield (idx, solve_pair(task, **self.options))
+
+  def _run_parallel(self, tasks):
+
+    broken = []
+    with ProcessPoolExecutor(self.jobs) as pool:
+      futures = {
+        pool.submit(solve_pair, task, **self.options): idx
+        for (idx, task) in enumerate(tasks)
+      }
+      for future in as_completed(futures):
+        try:
+          result = future.result()
+        except BrokenProcessPool:
+          broken.append(futures[future])
+          continue
+        yield (futures[future], result)
+
+    broken.sort()
+    for (idx, result) in self._run_isolated([tasks[i] for i in broken]):
+      yield (broken[idx], result)
+
+  def _run_isolated(self, tasks):
+
+    pending = deque(enumerate(tasks))
+    running = {}
+    while pending or running:
+
+      while pending and len(running) < self.jobs:
+        (idx, task) = pending.popleft()
+        (reader, writer) = mp.Pipe(duplex=False)
+        process = mp.Process(
+          target=isolated_pair,
+          args=(writer, task, self.max_memory, self.options),
+          daemon=True,
+        )
+        process.start()
+        writer.close()
+        running[reader] = (idx, task, process, time.perf_counter())
+
+      wait_for = None
+      if self.timeout:
+        now = time.perf_counter()
+        wait_for = max(0, min(
+          start + self.timeout - now
+          for (*_, start) in running.values()
+        ))
+      ready = wait(list(running), wait_for)
+
+      now = time.perf_counter()
+      for reader in list(running):
+        (idx, task, process, start) = running[reader]
+        if reader in ready:
+          try:
+            result = reader.recv()
+          except EOFError:
+            process.join()
+            result = self._dead_result(task, now - start, process)
+        elif self.timeout and now - start >= self.timeout:
+          process.kill()
+          result = Result(
+            elapsed=Duration([int((now - start) * Duration.NS)]),
+            expected=task.puzzle_input.solution,
+            input_name=task.puzzle_input.path.name,
+            observed=None,
+            state=State.TIMEOUT,
+          )
+        else:
+          continue
+        process.join()
+        reader.close()
+        del running[reader]
+        yield (idx, result)
+
+  @property
+  def options(self) -> dict:
+
+    return {
+      'repeat': self.repeat,
+      'warmup': self.warmup,
+      'memory': self.memory,
+      'profile': self.profile,
+    }
+
+  @property
+  def cache_options(self) -> dict:
+
+    return {
+      **self.options,
+      'isolate': self.isolate,
+      'max_memory': self.max_memory,
+      'timeout': self.timeout,
+    }
+
+  def _dead_result(self, task, elapsed, process) -> Result:
+
+    if process.exitcode == -signal.SIGKILL:
+      (observed, state) = (None, State.OOM)
+    else:
+      (observed, state) = (f'child exited with code {process.exitcode}', None)
+
+    return Result(
+      elapsed=Duration([int(elapsed * Duration.NS)]),
+      expected=task.puzzle_input.solution,
+      input_name=task.puzzle_input.path.name,
+      observed=observed,
+      state=state or State.ERROR,
+    )
+
+
+def load_module(solution_file: Path, day_dir: Path | None = None):
+
+  if (mod := MODULES.get(solution_file)):
+    return mod
+
+  day_dir = str(day_dir or solution_file.parent.parent.parent)
+  if sys.path[0] != day_dir:
+    for name in list(sys.modules):
+      if name.split('.')[0] in PART_PACKAGES:
+        del sys.modules[name]
+    if day_dir in sys.path:
+      sys.path.remove(day_dir)
+    sys.path.insert(0, day_dir)
+
+  spec = imp.spec_from_file_location(solution_file.stem, solution_file)
+  mod = imp.module_from_spec(spec)
+  spec.loader.exec_module(mod)
+  MODULES[solution_file] = mod
+
+  return mod
+
+
+def unload_modules(solution_files: set[Path]):
+
+  for solution_file in solution_files:
+    MODULES.pop(solution_file, None)
+
+  for name in list(sys.modules):
+    if name.split('.')[0] in PART_PACKAGES:
+      del sys.modules[name]
+
+
+def solve_pair(task: Task, **options) -> Result:
+
+  solution = getattr(load_module(task.solution_file), task.class_name)()
+  return solution._solve(task.puzzle_input, **options)
+
+
+def isolated_pair(conn, task: Task, max_memory: int | None, options: dict):
+
+  if max_memory:
+    resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
+
+  conn.send(solve_pair(task, **options))
+  conn.close()
+
+
+MODULES: dict[Path, object] = {}
+PART_PACKAGES = ('a', 'b')
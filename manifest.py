@@ -0,0 +1,147 @@
+import ast
+from dataclasses import dataclass, field
+import marshal
+import os
+from pathlib import Path
+
+
+@dataclass
+class Manifest:
+
+  root: Path = Path(__file__).resolve().parent
+  path: Path = Path(__file__).resolve().parent / '.cache' / 'manifest.bin'
+
+  _entry: dict | None = field(default=None, repr=False)
+
+  INPUT_DIR_NAME = 'input'
+  SOLUTION_DIR_NAME = 'solution'
+
+  VERSION = 2
+
+  def years(self) -> list[str]:
+
+    entry = self._load()
+    if entry['root'] != (mtime := self._mtime(self.root)):
+      entry['root'] = mtime
+      entry['years'] = sorted(
+        name for name in os.listdir(self.root)
+        if len(name) == 4 and name.startswith('2') and name.isdigit()
+      )
+      self._save()
+
+    return entry['years']
+
+  def puzzles(self, year: str) -> list[tuple[int, str]]:
+
+    entry = self._load()
+    if not self._is_fresh(record := entry['puzzles'].get(year)):
+      record = entry['puzzles'][year] = self._scan_year(self.root / year)
+      self._save()
+
+    return [tuple(puzzle) for puzzle in record['puzzles']]
+
+  def inputs(self, part_dir: Path) -> list[str]:
+
+    return self._part(part_dir)['inputs']
+
+  def solutions(self, part_dir: Path) -> dict[str, list[str]]:
+
+    return self._part(part_dir)['solutions']
+
+  def _part(self, part_dir: Path) -> dict:
+
+    entry = self._load()
+    if not self._is_fresh(record := entry['parts'].get(str(part_dir))):
+      record = entry['parts'][str(part_dir)] = self._scan_part(part_dir)
+      self._save()
+
+    return record
+
+  def _scan_year(self, year_dir: Path) -> dict:
+
+    (stamps, puzzles) = ({str(year_dir): self._mtime(year_dir)}, [])
+    for day in os.scandir(year_dir):
+      if not (day.is_dir() and day.name.startswith('day_')):
+        continue
+      stamps[day.path] = self._mtime(day.path)
+      for part in os.scandir(day.path):
+        if part.is_dir():
+          stamps[part.path] = self._mtime(part.path)
+          if os.path.isdir(os.path.join(part.path, self.SOLUTION_DIR_NAME)):
+            puzzles.append((int(day.name.split('_', 1)[-1]), part.name))
+
+    return {'stamps': stamps, 'puzzles': sorted(puzzles)}
+
+  def _scan_part(self, part_dir: Path) -> dict:
+
+    (stamps, inputs, solutions) = ({}, [], {})
+
+    input_dir = part_dir / self.INPUT_DIR_NAME
+    stamps[str(input_dir)] = self._mtime(input_dir)
+    if stamps[str(input_dir)] is not None:
+      inputs = sorted(
+        entry.name for entry in os.scandir(input_dir) if entry.is_file()
+      )
+
+    solution_dir = part_dir / self.SOLUTION_DIR_NAME
+    stamps[str(solution_dir)] = self._mtime(solution_dir)
+    if stamps[str(solution_dir)] is not None:
+      for entry in sorted(os.scandir(solution_dir), key=lambda e: e.name):
+        if entry.is_file() and entry.name.endswith('.py'):
+          stamps[entry.path] = self._mtime(entry.path)
+          solutions[entry.name] = self._class_names(Path(entry.path))
+
+    return {'stamps': stamps, 'inputs': inputs, 'solutions': solutions}
+
+  def _load(self) -> dict:
+
+    if self._entry is None:
+      try:
+        with open(self.path, 'rb') as file:
+          self._entry = marshal.load(file)
+      except (OSError, EOFError, ValueError, TypeError):
+        pass
+      if not self._entry or self._entry.get('version') != self.VERSION:
+        self._entry = {
+          'version': self.VERSION,
+          'root': None,
+          'years': [],
+          'puzzles': {},
+          'parts': {},
+        }
+
+    return self._entry
+
+  def _save(self):
+
+    self.path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = self.path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp, 'wb') as file:
+      marshal.dump(self._entry, file)
+    tmp.replace(self.path)
+
+  def _is_fresh(self, record: dict | None) -> bool:
+
+    return bool(record) and all(
+      self._mtime(path) == mtime for (path, mtime) in record['stamps'].items()
+    )
+
+  @staticmethod
+  def _mtime(path: Path | str) -> int | None:
+
+    try:
+      return os.stat(path).st_mtime_ns
+    except OSError:
+      return None
+
+  @staticmethod
+  def _class_names(path: Path) -> list[str]:
+
+    try:
+      tree = ast.parse(path.read_bytes(), str(path))
+    except SyntaxError:
+      return []
+
+    return sorted(
+      node.name for node in tree.body if isinstance(node, ast.ClassDef)
+    )
@@ -1,25 +1,136 @@
 #!/usr/bin/env python3
 
+from array import array
 from contextlib import nullcontext
 from dataclasses import dataclass, field, fields
+from functools import cached_property
+from hashlib import sha256
+from itertools import accumulate
+import marshal
+import mmap
+from operator import add
 from pathlib import Path
 import sys
+import time
+from typing import Iterator
+from weakref import WeakValueDictionary
+
+try:
+  import numpy as np
+except ImportError:
+  np = None
+
+
+@dataclass
+class InputBuffer:
+  data: memoryview
+  sep: bytes = b'#'
+
+  @property
+  def starts(self) -> array:
+
+    return self._offsets[0]
+
+  @property
+  def ends(self) -> array:
+
+    return self._offsets[1]
+
+  @cached_property
+  def _offsets(self) -> tuple[array, array]:
+
+    (starts, ends) = (array('Q'), array('Q'))
+    if np is None:
+      self._scan_offsets(starts, ends)
+    else:
+      self._scan_offsets_numpy(starts, ends)
+
+    while starts and starts[-1] == ends[-1]:
+      starts.pop()
+      ends.pop()
+
+    return (starts, ends)
+
+  def _scan_offsets(self, starts: array, ends: array):
+
+    body = self.data.tobytes()
+    lengths = list(map(len, body.split(b'\n')))
+    starts.extend(accumulate(map((1).__add__, lengths[:-1]), initial=0))
+    ends.extend(map(add, starts, lengths))
+
+    if b'\r' in body or body.startswith(self.sep) or b'\n' + self.sep in body:
+      lines = [
+        (start, end - (body[end - 1:end] == b'\r'))
+        for (start, end) in zip(starts, ends)
+        if body[start:start + 1] != self.sep
+      ]
+      starts[:] = array('Q', (start for (start, _) in lines))
+      ends[:] = array('Q', (end for (_, end) in lines))
+
+  def _scan_offsets_numpy(self, starts: array, ends: array):
+
+    body = np.frombuffer(self.data, np.uint8)
+    if not len(body):
+      return
+    newlines = np.flatnonzero(body == ord('\n'))
+    line_starts = np.concatenate(([0], newlines + 1))
+    line_ends = np.append(newlines, len(body))
+
+    line_ends -= (line_ends > line_starts) & (
+      body[np.maximum(line_ends, 1) - 1] == ord('\r')
+    )
+    keep = body[np.minimum(line_starts, len(body) - 1)] != ord(self.sep)
+    keep |= line_starts == len(body)
+
+    starts.frombytes(line_starts[keep].astype(np.uint64).tobytes())
+    ends.frombytes(line_ends[keep].astype(np.uint64).tobytes())
+
+  def __len__(self) -> int:
+
+    return len(self.starts)
+
+  def __getitem__(self, idx: int) -> memoryview:
+
+    return self.data[self.starts[idx]:self.ends[idx]]
+
+  def __iter__(self) -> Iterator[memoryview]:
+
+    data = self.data
+    return (data[start:end] for (start, end) in zip(self.starts, self.ends))
+
+
+class SharedLines(list):
+  pass
 
 
 @dataclass
 class PuzzleInput:
   path: Path
   solution: int
-  lines: list[str] = field(repr=False)
+  lines: list[str] | None = field(repr=False)
   base: Path = None
+  load_ns: int = field(default=0, repr=False)
+  source: Path = field(default=None, repr=False)
 
   SEP = '#'
 
+  CACHE_DIR = Path(__file__).resolve().parent / '.cache' / 'inputs'
+  CACHE_VERSION = 1
+
+  _shared = WeakValueDictionary()
+
   @classmethod
   def parse(
-    cls: type['PuzzleInput'], path: Path | str, seen: list[Path] = None
+    cls: type['PuzzleInput'],
+    path: Path | str,
+    seen: list[Path] = None,
+    stream: bool = False,
+    cache: bool = False,
   ) -> 'PuzzleInput':
 
+    if cache and not stream:
+      return cls._parse_cached(path)
+
     def fatal(exc: Exception):
       print(
         '\n'.join(
@@ -31,8 +142,9 @@ class PuzzleInput:
       )
       raise exc
 
+    start = time.perf_counter_ns()
     path = Path(path).resolve()
-    seen = seen or []
+    seen = [] if seen is None else seen
     seen.append(path)
     if path in seen[:-1]:
       fatal(RuntimeError('PuzzleInput import cycle'))
@@ -43,6 +155,8 @@ class PuzzleInput:
         for line in file:
           if (line := line.strip()).startswith(cls.SEP):
             in_text = True
+            if stream:
+              break
           else:
             (text if in_text else meta).append(line)
     except Exception as e:
@@ -56,11 +170,144 @@ class PuzzleInput:
       (key, val) = map(str.strip, line.split('=', 1))
       metadata[key] = data_fields[key].type(val)
 
+    source = path
     if base := metadata.get('base'):
       metadata['base'] = base if base.is_absolute() else path.parent / base
-      text = cls.parse(metadata['base'], seen).lines
+      base = cls.parse(metadata['base'], seen, stream)
+      (text, source) = (base.lines, base.source)
+
+    if stream:
+      text = None
+    else:
+      while not text[-1]:
+        del text[-1]
+
+    return cls(
+      path=path,
+      lines=text,
+      load_ns=time.perf_counter_ns() - start,
+      source=source,
+      **metadata,
+    )
+
+  @classmethod
+  def _parse_cached(cls, path: Path | str) -> 'PuzzleInput':
+
+    start = time.perf_counter_ns()
+    path = Path(path).resolve()
+    entry_file = cls.CACHE_DIR / (sha256(bytes(path)).hexdigest() + '.bin')
+
+    entry = None
+    try:
+      with open(entry_file, 'rb') as file:
+        entry = marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):
+      pass
+
+    if not cls._is_fresh(entry):
+      seen = []
+      puzzle_input = cls.parse(path, seen)
+      entry = {
+        'version': cls.CACHE_VERSION,
+        'chain': [
+          (str(path), *cls._fingerprint(path), cls._digest(path))
+          for path in seen
+        ],
+        'solution': puzzle_input.solution,
+        'base': puzzle_input.base and str(puzzle_input.base),
+        'lines': puzzle_input.lines,
+      }
+      cls.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+      with open(entry_file, 'wb') as file:
+        marshal.dump(entry, file)
+
+    (source, *_, digest) = entry['chain'][-1]
+    if (lines := cls._shared.get((source, digest))) is None:
+      lines = cls._shared[(source, digest)] = SharedLines(entry['lines'])
+
+    return cls(
+      path=path,
+      solution=entry['solution'],
+      lines=lines,
+      base=entry['base'] and Path(entry['base']),
+      load_ns=time.perf_counter_ns() - start,
+      source=Path(source),
+    )
+
+  @classmethod
+  def _is_fresh(cls, entry: dict | None) -> bool:
+
+    if not entry or entry.get('version') != cls.CACHE_VERSION:
+      return False
+
+    for (path, mtime_ns, size, digest) in entry['chain']:
+      try:
+        if cls._fingerprint(path) == (mtime_ns, size):
+          continue
+        if cls._digest(path) != digest:
+          return False
+      except OSError:
+        return False
+
+    return True
+
+  @staticmethod
+  def _fingerprint(path: Path | str) -> tuple[int, int]:
+
+    stat = Path(path).stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+  @staticmethod
+  def _digest(path: Path | str) -> str:
+
+    with open(path, 'rb') as file:
+      return sha256(file.read()).hexdigest()
+
+  @property
+  def size(self) -> int:
+
+    if self.lines is not None:
+      return sum(map(len, self.lines)) + len(self.lines)
+    return self.source.stat().st_size
+
+  def buffer(self) -> InputBuffer:
+
+    with open(self.source, 'rb') as file:
+      try:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+      except ValueError:
+        data = b''
+
+    sep = self.SEP.encode()
+    if data[:1] == sep:
+      pos = 0
+    elif (pos := data.find(b'\n' + sep)) >= 0:
+      pos += 1
+    else:
+      pos = len(data)
+    start = data.find(b'\n', pos) + 1 or len(data)
+
+    return InputBuffer(data=memoryview(data)[start:], sep=sep)
+
+  def iter_lines(self) -> Iterator[str]:
+
+    if self.lines is not None:
+      return iter(self.lines)
+    return self._stream()
 
-    while not text[-1]:
-      del text[-1]
+  def _stream(self) -> Iterator[str]:
 
-    return cls(path=path, lines=text, **metadata)
+    blanks = 0
+    with open(self.source) as file:
+      for line in file:
+        if line.strip().startswith(self.SEP):
+          break
+      for line in file:
+        if (line := line.strip()).startswith(self.SEP):
+          continue
+        if not line:
+          blanks += 1
+          continue
+        yield from blanks * ['']
+        blanks = 0
+        yield line
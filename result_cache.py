@@ -0,0 +1,113 @@
+import ast
+from dataclasses import dataclass, field, replace
+from hashlib import sha256
+from pathlib import Path
+import pickle
+import sys
+
+from base import Result
+from executor import Task
+
+
+@dataclass
+class ResultCache:
+
+  directory: Path = Path(__file__).resolve().parent / '.cache' / 'results'
+
+  _inputs: dict[Path, str] = field(default_factory=dict, repr=False)
+  _modules: dict[Path, str] = field(default_factory=dict, repr=False)
+
+  def get(self, task: Task, options: dict) -> Result | None:
+
+    try:
+      with open(self._path(task, options), 'rb') as file:
+        result = pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+      return None
+
+    return replace(result, cached=True)
+
+  def put(self, task: Task, options: dict, result: Result):
+
+    self.directory.mkdir(parents=True, exist_ok=True)
+    path = self._path(task, options)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'wb') as file:
+      pickle.dump(result, file)
+    tmp.replace(path)
+
+  def clear(self):
+
+    self._inputs.clear()
+    self._modules.clear()
+
+  def _path(self, task: Task, options: dict) -> Path:
+
+    key = repr((
+      sys.version,
+      self._module_digest(task.solution_file),
+      task.class_name,
+      self._input_digest(task),
+      task.puzzle_input.lines is None,
+      sorted(options.items()),
+    ))
+
+    return self.directory / (sha256(key.encode()).hexdigest() + '.pickle')
+
+  def _input_digest(self, task: Task) -> str:
+
+    puzzle_input = task.puzzle_input
+    if (digest := self._inputs.get(puzzle_input.path)) is None:
+      with open(puzzle_input.source or puzzle_input.path, 'rb') as file:
+        digest = sha256(file.read()).hexdigest()
+      digest = repr((puzzle_input.path.name, puzzle_input.solution, digest))
+      self._inputs[puzzle_input.path] = digest
+
+    return digest
+
+  def _module_digest(self, solution_file: Path) -> str:
+
+    if (digest := self._modules.get(solution_file)) is None:
+      digest = sha256()
+      for path in sorted(local_sources(solution_file)):
+        digest.update(str(path).encode())
+        digest.update(path.read_bytes())
+      self._modules[solution_file] = digest = digest.hexdigest()
+
+    return digest
+
+
+def local_sources(
+  solution_file: Path, day_dir: Path | None = None
+) -> set[Path]:
+
+  day_dir = day_dir or solution_file.parent.parent.parent
+  sources = {solution_file} | {BASE_DIR / name for name in ALWAYS}
+  for path in list(sources):
+    _local_imports(path, day_dir, sources)
+
+  return sources
+
+
+def _local_imports(path: Path, day_dir: Path, found: set[Path]):
+
+  for node in ast.walk(ast.parse(path.read_bytes(), str(path))):
+    if isinstance(node, ast.Import):
+      names = [alias.name for alias in node.names]
+    elif isinstance(node, ast.ImportFrom) and not node.level:
+      names = [node.module]
+    else:
+      continue
+
+    for name in names:
+      for root in (day_dir, BASE_DIR):
+        candidate = root.joinpath(*name.split('.')).with_suffix('.py')
+        if candidate.is_file():
+          if candidate not in found:
+            found.add(candidate)
+            _local_imports(candidate, day_dir, found)
+          break
+
+
+BASE_DIR = Path(__file__).resolve().parent
+ALWAYS = ('base.py', )
@@ -1,42 +1,404 @@
 #!/usr/bin/env python3
 
 from argparse import ArgumentParser
+from contextlib import redirect_stderr, redirect_stdout
+import csv
 from dataclasses import dataclass
 from datetime import datetime
-from importlib import util as imp
 from inspect import getmembers, isclass
+import json
+import marshal
+from math import exp, log
+import os
 from pathlib import Path
 from pprint import pprint
+import re
+import socket
 import sys
 import time
+from traceback import format_exc
 
 BASE_DIR = Path(__file__).resolve().parent
 sys.path.insert(0, str(BASE_DIR))
 
-from base import GREEN, RED, RESET, YELLOW, Result, Solution
+from base import (
+  GREEN,
+  RED,
+  RESET,
+  YELLOW,
+  Duration,
+  Generator,
+  Memory,
+  Result,
+  Solution,
+  State,
+)
+from client import SOCKET_PATH
+from executor import MODULES, Executor, Task, load_module, unload_modules
+from manifest import Manifest
 from puzzle_input import PuzzleInput
+from result_cache import ResultCache, local_sources
 
 
 def main(
-  puzzle_dir: Path,
-  class_prefix: str,
+  puzzles: list[tuple[Path, str]],
+  export: Path | None = None,
+  force: bool = False,
+  generate: list[int] | None = None,
+  input_cache: bool = True,
   input_file: Path | None = None,
+  isolate: bool = False,
+  jobs: int = 1,
+  matrix: str | None = None,
+  max_memory: int | None = None,
+  memory: bool = False,
+  phases: bool = False,
+  pin_cpu: int | None = None,
+  profile: Path | None = None,
   quiet: bool = False,
+  repeat: int = 1,
+  result_cache: bool = True,
+  scaling: list[int] | None = None,
+  scaling_threshold: float = 0.25,
   skip: list = None,
+  stream: bool = False,
+  timeout: float | None = None,
   verbose: int = 0,
+  warmup: int = 0,
+  watch: bool = False,
 ):
 
-  runner = PuzzleRunner(
-    class_prefix=class_prefix,
-    puzzle_dir=puzzle_dir,
-    extra_input=input_file,
-    skip=skip,
+  if pin_cpu is not None:
+    if not hasattr(os, 'sched_setaffinity'):
+      warning('CPU pinning is not supported on this platform')
+    else:
+      os.sched_setaffinity(0, {pin_cpu})
+      if jobs != 1 and not quiet:
+        warning(f'all {jobs or os.cpu_count()} jobs are pinned to one CPU')
+
+  generate = (generate or []) + (scaling or [])
+  day_dirs = dict.fromkeys(puzzle_dir.parent for (puzzle_dir, _) in puzzles)
+  for day_dir in day_dirs:
+    for scale in generate:
+      for path in generate_inputs(day_dir, scale):
+        print(f'generated {path.relative_to(BASE_DIR)}', flush=True)
+  if generate:
+    print()
+
+  executor = Executor(
+    cache=ResultCache() if result_cache else None,
+    force=force,
+    isolate=isolate,
+    jobs=jobs,
+    max_memory=max_memory and max_memory * 1024 ** 2,
+    memory=memory,
+    profile=bool(profile),
+    repeat=repeat,
+    timeout=timeout,
+    warmup=warmup,
   )
+  runners = [
+    PuzzleRunner(
+      class_prefix=class_prefix,
+      puzzle_dir=puzzle_dir,
+      executor=executor,
+      extra_input=input_file,
+      input_cache=input_cache,
+      phases=phases,
+      skip=skip,
+      stream=stream,
+    )
+    for (puzzle_dir, class_prefix) in puzzles
+  ]
   if verbose >= 2:
-    pprint(runner)
+    pprint(runners)
     print()
 
-  runner.run(pre_output=(verbose >= 1))
+  for runner in runners:
+    runner.prepare(verbose >= 1)
+  if matrix:
+    named = [runner for runner in runners if runner.has_solution(matrix)]
+    try:
+      for runner in named or runners:
+        runner._find_solution(matrix)
+    except RuntimeError as e:
+      sys.exit(f'{RED}ERROR: {e}{RESET}')
+
+  if len(runners) == 1:
+    (runner, ) = runners
+    runner.run(pre_output=(verbose >= 1))
+  else:
+    batch = BatchRunner(runners, executor)
+    batch.run(pre_output=(verbose >= 1))
+
+  for runner in runners:
+    if not runner._results:
+      continue
+    if profile:
+      runner.write_profiles(profile / runner.name.replace('/', '_'))
+    baseline = matrix or None
+    if len(runners) > 1 and baseline and not runner.has_solution(baseline):
+      baseline = None
+    if matrix is not None:
+      print(runner.to_str_matrix(baseline))
+    if scaling is not None:
+      print(runner.to_str_scaling(scaling_threshold))
+    if export:
+      path = export
+      if len(runners) > 1:
+        suffix = runner.name.replace('/', '_')
+        path = export.with_name(f'{export.stem}.{suffix}{export.suffix}')
+      runner.export(path, baseline)
+
+  if len(runners) > 1:
+    print(batch)
+
+  if watch:
+    try:
+      Watcher(runners).run()
+    except KeyboardInterrupt:
+      print()
+
+
+@dataclass
+class Server:
+
+  path: Path = SOCKET_PATH
+  interval: float = 1.0
+
+  _core: dict[Path, int] = None
+  _sources: dict[Path, dict[Path, int]] = None
+
+  def run(self):
+
+    self._core = self._mtimes(Watcher.CORE)
+    self._sources = {}
+
+    self.path.parent.mkdir(parents=True, exist_ok=True)
+    self.path.unlink(missing_ok=True)
+    with socket.socket(socket.AF_UNIX) as sock:
+      sock.bind(str(self.path))
+      sock.listen()
+      sock.settimeout(self.interval)
+      print(f'serving on {self.path}', flush=True)
+      try:
+        while True:
+          try:
+            (conn, _) = sock.accept()
+          except socket.timeout:
+            if self._mtimes(Watcher.CORE) != self._core:
+              break
+            continue
+          with conn:
+            conn.settimeout(None)
+            self._handle(conn)
+      except KeyboardInterrupt:
+        print()
+        return
+      finally:
+        self.path.unlink(missing_ok=True)
+
+    print(f'{YELLOW}core module changed; restarting{RESET}', flush=True)
+    os.execv(sys.executable, [sys.executable] + sys.argv)
+
+  def _handle(self, conn: socket.socket):
+
+    with conn.makefile('rb') as reader:
+      request = json.loads(reader.readline())
+
+    self._refresh()
+    cwd = os.getcwd()
+    with conn.makefile('w', encoding='utf-8') as out:
+      code = 0
+      try:
+        os.chdir(request['cwd'])
+        with redirect_stdout(out), redirect_stderr(out):
+          args = get_args(request['argv'])
+          if args.__dict__.pop('serve'):
+            raise RuntimeError('already serving')
+          if args.pin_cpu is not None or args.watch:
+            raise RuntimeError('--pin-cpu and --watch need a direct run')
+          main(**vars(args))
+      except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 1
+      except KeyboardInterrupt:
+        raise
+      except BaseException as e:
+        out.write(f'{RED}{type(e).__name__}: {e}{RESET}\n')
+        code = 1
+      finally:
+        os.chdir(cwd)
+      try:
+        out.write(f'\0{code}\n')
+        out.flush()
+      except OSError:
+        pass
+
+    self._track()
+
+  def _refresh(self):
+
+    stale = {
+      path for path in MODULES
+      if self._mtimes(self._sources.get(path, {})) != self._sources.get(path)
+    }
+    unload_modules(stale)
+    for path in stale:
+      self._sources.pop(path, None)
+
+  def _track(self):
+
+    for path in MODULES:
+      if path not in self._sources:
+        day_dir = path.parent if path.name == GENERATOR_FILE_NAME else None
+        self._sources[path] = self._mtimes(local_sources(path, day_dir))
+
+  @staticmethod
+  def _mtimes(paths) -> dict[Path, int]:
+
+    mtimes = {}
+    for path in paths:
+      try:
+        mtimes[path] = path.stat().st_mtime_ns
+      except OSError:
+        pass
+
+    return mtimes
+
+
+@dataclass
+class Watcher:
+
+  runners: list['PuzzleRunner']
+  interval: float = 0.5
+
+  CORE = {
+    BASE_DIR / name
+    for name in (
+      'base.py',
+      'client.py',
+      'executor.py',
+      'manifest.py',
+      'puzzle_input.py',
+      'result_cache.py',
+      'run.py',
+    )
+  }
+
+  def run(self):
+
+    watched = [runner.watched() for runner in self.runners]
+    mtimes = [
+      self._scan(runner, paths)
+      for (runner, paths) in zip(self.runners, watched)
+    ]
+
+    while True:
+      time.sleep(self.interval)
+      for (idx, runner) in enumerate(self.runners):
+        current = self._scan(runner, watched[idx])
+        changed = {
+          path for path in current.keys() | mtimes[idx].keys()
+          if current.get(path) != mtimes[idx].get(path)
+        }
+        if not changed:
+          continue
+
+        if changed & self.CORE:
+          print(f'{YELLOW}core module changed; restarting{RESET}', flush=True)
+          os.execv(sys.executable, [sys.executable] + sys.argv)
+
+        print(f'========== changed: {runner.name} ==========')
+        print('\n'.join(str(path.relative_to(BASE_DIR)) for path in changed))
+        print(flush=True)
+        runner.rerun(changed)
+        watched[idx] = runner.watched()
+        mtimes[idx] = self._scan(runner, watched[idx])
+
+  def _scan(self, runner, watched) -> dict[Path, int]:
+
+    paths = set(watched) | self.CORE
+    for directory in (runner._input_dir, runner._solution_dir):
+      paths |= {
+        path.resolve() for path in directory.iterdir() if path.is_file()
+      }
+
+    mtimes = {}
+    for path in paths:
+      try:
+        mtimes[path] = path.stat().st_mtime_ns
+      except OSError:
+        pass
+
+    return mtimes
+
+
+@dataclass
+class BatchRunner:
+
+  runners: list['PuzzleRunner']
+  executor: Executor
+
+  _elapsed: Duration = None
+
+  SLOWEST = 5
+
+  def run(self, output=True, pre_output=False):
+
+    start = time.perf_counter_ns()
+
+    (tasks, owners) = ([], [])
+    for runner in self.runners:
+      if runner._inputs is None:
+        runner.prepare(pre_output)
+      runner_tasks = runner.tasks()
+      owners += [(runner, idx) for idx in range(len(runner_tasks))]
+      tasks += runner_tasks
+
+    pending = list(self.runners)
+    for (idx, result) in self.executor.run(tasks):
+      (runner, runner_idx) = owners[idx]
+      runner.receive(runner_idx, result)
+      while pending and pending[0].flush(output):
+        pending.pop(0)
+    while pending and pending[0].flush(output):
+      pending.pop(0)
+
+    self._elapsed = Duration([time.perf_counter_ns() - start])
+
+  def __str__(self):
+
+    totals = []
+    failures = []
+    for runner in self.runners:
+      elapsed = 0
+      for (key, results) in runner._results.items():
+        for result in results:
+          elapsed += sum(result.elapsed.samples)
+          if not result.correct:
+            failures.append(
+              f'{runner.name} {key} {result.input_name}: {result.state.name}'
+            )
+      totals.append((elapsed, runner.name))
+
+    total = sum(elapsed for (elapsed, _) in totals)
+    lines = ['========== summary ==========']
+    lines.append('{} puzzles | wall {} | solve {}'.format(
+      len(self.runners), self._elapsed, Duration([total])
+    ))
+
+    lines.append('slowest:')
+    width = max(len(name) for (_, name) in totals)
+    for (elapsed, name) in sorted(totals, reverse=True)[:self.SLOWEST]:
+      lines.append(f'    {name:>{width}} | {Duration([elapsed])}')
+
+    lines.append('{}failures: {}{}'.format(
+      RED if failures else GREEN, len(failures), RESET
+    ))
+    lines += [f'    {failure}' for failure in failures]
+    lines.append('')
+
+    return '\n'.join(lines)
 
 
 @dataclass
@@ -45,30 +407,53 @@ class PuzzleRunner:
   class_prefix: str
   puzzle_dir: Path
 
+  executor: Executor = None
   extra_input: Path | None = None
+  input_cache: bool = True
+  phases: bool = False
   skip: set | None = None
+  stream: bool = False
 
   _input_dir: Path = None
   _solution_dir: Path = None
 
   _inputs: list[PuzzleInput] | None = None
   _results: dict[str, list[Result]] | None = None
+  _slots: list[tuple[str, list[Result | None]]] | None = None
   _solutions: dict[str, list[Solution]] | None = None
-
-  INPUT_DIR_NAME = 'input'
-  SOLUTION_DIR_NAME = 'solution'
+  _errors: dict[str, str] | None = None
+
+  INPUT_DIR_NAME = Manifest.INPUT_DIR_NAME
+  SOLUTION_DIR_NAME = Manifest.SOLUTION_DIR_NAME
+
+  SCALING_INPUTS = re.compile(r'final\.txt|x?\d+\.txt')
+
+  MATRIX_FIELDS = (
+    'elapsed',
+    'best',
+    'mean',
+    'stdev',
+    'iqr',
+    'samples',
+    'state',
+    'correct',
+    'speedup',
+    'peak_memory',
+    'net_memory',
+    'load',
+    'parse',
+  )
 
   def __post_init__(self):
 
     self.skip = set(self.skip or [])
+    self.executor = self.executor or Executor()
 
     self._input_dir = self.puzzle_dir / self.INPUT_DIR_NAME
     self._solution_dir = self.puzzle_dir / self.SOLUTION_DIR_NAME
 
   def prepare(self, output=False):
 
-    sys.path.insert(0, str(self.puzzle_dir.parent))
-
     self._inputs = self._gather_inputs()
     self._solutions = self._gather_solutions()
 
@@ -82,48 +467,394 @@ class PuzzleRunner:
       if self._inputs is None:
         self.prepare(pre_output)
 
-      self._results = {}
-      for (file_name, solutions) in self._solutions.items():
-        for solution in solutions:
-          key = f'{file_name}.{type(solution).__name__}'
-          self._results[key] = input_results = []
-          for puzzle_input in self._inputs:
-            input_results.append(solution._solve(puzzle_input))
-          if output:
-            print(self._to_str_solution(key, input_results), flush=True)
-
-  def _gather_inputs(self) -> list[PuzzleInput]:
-
-    inputs = [
-      PuzzleInput.parse(path)
-      for path in sorted(self._input_dir.iterdir())
-      if path.is_file() and path.name not in self.skip
+      tasks = self.tasks()
+      for (idx, result) in self.executor.run(tasks):
+        self.receive(idx, result)
+        self.flush(output)
+      self.flush(output)
+
+  def rerun(self, changed: set[Path], output=True):
+
+    previous = {
+      (key, result.input_name): result
+      for (key, results) in self._results.items()
+      for result in results
+    }
+    dirty_solutions = {
+      solution_file for solution_file in self._solution_files()
+      if (sources := self._local_sources(solution_file)) is None
+      or solution_file in changed
+      or sources & changed
+    }
+    unload_modules(dirty_solutions)
+    if self.executor.cache:
+      self.executor.cache.clear()
+
+    inputs = {puzzle_input.path: puzzle_input for puzzle_input in self._inputs}
+    self._inputs = self._gather_inputs(inputs, changed)
+    self._solutions = self._gather_solutions()
+
+    tasks = self.tasks()
+    dirty = []
+    for (idx, task) in enumerate(tasks):
+      key = self._slots[idx // len(self._inputs)][0]
+      result = previous.get((key, task.puzzle_input.path.name))
+      if (
+        result
+        and task.solution_file not in dirty_solutions
+        and inputs.get(task.puzzle_input.path) is task.puzzle_input
+      ):
+        self.receive(idx, result)
+      else:
+        dirty.append(idx)
+
+    for (dirty_idx, result) in self.executor.run([tasks[idx] for idx in dirty]):
+      self.receive(dirty[dirty_idx], result)
+      self.flush(output)
+    self.flush(output)
+
+  def watched(self) -> set[Path]:
+
+    paths = set()
+    for puzzle_input in self._inputs:
+      paths |= {puzzle_input.path, puzzle_input.source}
+      if puzzle_input.base:
+        paths.add(puzzle_input.base.resolve())
+    for solution_file in self._solution_files():
+      paths |= self._local_sources(solution_file) or {solution_file}
+
+    return paths
+
+  def tasks(self) -> list[Task]:
+
+    self._results = {}
+    self._slots = []
+    tasks = []
+    for (file_name, solutions) in self._solutions.items():
+      solution_file = (self._solution_dir / f'{file_name}.py').resolve()
+      for solution in solutions:
+        name = type(solution).__name__
+        self._slots.append((f'{file_name}.{name}', [None] * len(self._inputs)))
+        tasks += [
+          Task(solution_file, name, puzzle_input)
+          for puzzle_input in self._inputs
+        ]
+
+    for (file_name, error) in self._errors.items():
+      self._slots.append((file_name, [
+        Result(
+          elapsed=Duration([0]),
+          expected=puzzle_input.solution,
+          input_name=puzzle_input.path.name,
+          observed=error,
+        )
+        for puzzle_input in self._inputs
+      ]))
+
+    return tasks
+
+  def receive(self, idx: int, result: Result):
+
+    (solution_idx, input_idx) = divmod(idx, len(self._inputs))
+    self._slots[solution_idx][1][input_idx] = result
+
+  def flush(self, output=True) -> bool:
+
+    while len(self._results) < len(self._slots):
+      (key, results) = self._slots[len(self._results)]
+      if not all(results):
+        return False
+      self._results[key] = results
+      if output:
+        print(self._to_str_solution(key, results), flush=True)
+
+    return True
+
+  @property
+  def name(self) -> str:
+
+    (day, which) = (self.puzzle_dir.parent.name, self.puzzle_dir.name)
+    return f'{self.puzzle_dir.parent.parent.name}/{int(day[4:])}{which}'
+
+  def matrix(self, baseline: str | None = None) -> dict:
+
+    baseline = self._find_solution(baseline)
+    baseline_results = {
+      result.input_name: result for result in self._results[baseline]
+    }
+
+    cells = {}
+    for (key, results) in self._results.items():
+      for result in results:
+        reference = baseline_results.get(result.input_name)
+        speedup = None
+        if reference and result.correct and reference.correct:
+          speedup = reference.elapsed.elapsed / result.elapsed.elapsed
+        cells.setdefault(result.input_name, {})[key] = {
+          'elapsed': result.elapsed.elapsed,
+          'best': result.elapsed.best,
+          'mean': result.elapsed.mean,
+          'stdev': result.elapsed.stdev,
+          'iqr': result.elapsed.iqr,
+          'samples': len(result.elapsed.samples),
+          'state': result.state.name,
+          'correct': result.correct,
+          'speedup': speedup,
+          'peak_memory': result.memory and result.memory.peak,
+          'net_memory': result.memory and result.memory.net,
+          'load': result.load and result.load.elapsed,
+          'parse': result.parse and result.parse.elapsed,
+        }
+
+    return {
+      'baseline': baseline,
+      'solutions': list(self._results),
+      'inputs': list(cells),
+      'cells': cells,
+    }
+
+  def scaling(self) -> dict[str, tuple[float, float, int]]:
+
+    sizes = {
+      puzzle_input.path.name: puzzle_input.size
+      for puzzle_input in self._inputs
+      if self.SCALING_INPUTS.fullmatch(puzzle_input.path.name)
+    }
+
+    fits = {}
+    for (key, results) in self._results.items():
+      points = [
+        (log(sizes[result.input_name]), log(result.elapsed.elapsed))
+        for result in results
+        if result.correct and result.input_name in sizes
+      ]
+      if len({x for (x, _) in points}) < 2:
+        continue
+
+      mean_x = sum(x for (x, _) in points) / len(points)
+      mean_y = sum(y for (_, y) in points) / len(points)
+      exponent = (
+        sum((x - mean_x) * (y - mean_y) for (x, y) in points)
+        / sum((x - mean_x) ** 2 for (x, _) in points)
+      )
+      coefficient = exp(mean_y - exponent * mean_x)
+      fits[key] = (exponent, coefficient, len(points))
+
+    return fits
+
+  def export(self, path: Path, baseline: str | None = None):
+
+    matrix = self.matrix(baseline)
+
+    if path.suffix == '.json':
+      with open(path, 'w') as file:
+        json.dump(matrix, file, indent=2)
+        file.write('\n')
+
+    elif path.suffix == '.csv':
+      with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['input', 'solution'] + list(self.MATRIX_FIELDS))
+        for (input_name, row) in matrix['cells'].items():
+          for (key, cell) in row.items():
+            writer.writerow(
+              [input_name, key] + [cell[name] for name in self.MATRIX_FIELDS]
+            )
+
+    else:
+      raise RuntimeError(f'unsupported export format: {path.suffix}')
+
+  def write_profiles(self, directory: Path):
+
+    directory.mkdir(parents=True, exist_ok=True)
+    for (key, results) in self._results.items():
+      for result in results:
+        if not result.profile:
+          continue
+        stem = directory / f'{key}.{Path(result.input_name).stem}'
+        with open(stem.with_name(stem.name + '.pstats'), 'wb') as file:
+          marshal.dump(result.profile.stats, file)
+        with open(stem.with_name(stem.name + '.collapsed'), 'w') as file:
+          file.writelines(f'{line}\n' for line in result.profile.collapsed)
+
+  def solution_keys(self) -> list[str]:
+
+    return [
+      f'{file_name}.{type(solution).__name__}'
+      for (file_name, solutions) in self._solutions.items()
+      for solution in solutions
+    ]
+
+  def has_solution(self, name: str) -> bool:
+
+    return any(
+      name in (key, key.split('.', 1)[-1]) for key in self.solution_keys()
+    )
+
+  def _find_solution(self, name: str | None) -> str:
+
+    if not name:
+      return next(iter(self._results))
+
+    keys = self.solution_keys()
+    matches = [key for key in keys if name in (key, key.split('.', 1)[-1])]
+    if len(matches) != 1:
+      raise RuntimeError('{} solution {}; choices:\n    {}'.format(
+        'ambiguous' if matches else 'no such',
+        name,
+        ', '.join(keys),
+      ))
+
+    return matches[0]
+
+  def _gather_inputs(
+    self,
+    previous: dict[Path, PuzzleInput] | None = None,
+    changed: set[Path] | None = None,
+  ) -> list[PuzzleInput]:
+
+    paths = [
+      (self._input_dir / name).resolve()
+      for name in MANIFEST.inputs(self.puzzle_dir)
+      if name not in self.skip
     ]
 
     if self.extra_input:
       if not self.extra_input.is_file():
         raise RuntimeError(f'not a file: {self.extra_input}')
-      inputs.append(PuzzleInput.parse(self.extra_input))
+      paths.append(self.extra_input.resolve())
+
+    inputs = []
+    for path in paths:
+      puzzle_input = (previous or {}).get(path)
+      if not puzzle_input or (changed or set()) & {
+        puzzle_input.path,
+        puzzle_input.source,
+        puzzle_input.base and puzzle_input.base.resolve(),
+      }:
+        puzzle_input = PuzzleInput.parse(
+          path, stream=self.stream, cache=self.input_cache
+        )
+      inputs.append(puzzle_input)
 
     return inputs
 
+  def _solution_files(self) -> list[Path]:
+
+    return [
+      (self._solution_dir / name).resolve()
+      for name in MANIFEST.solutions(self.puzzle_dir)
+    ]
+
   def _gather_solutions(self) -> dict[str, list[Solution]]:
 
-    solutions = {}
+    (solutions, self._errors) = ({}, {})
 
-    for solution_file in self._solution_dir.iterdir():
-      if not solution_file.is_file() or solution_file.suffix != '.py':
-        continue
-      spec = imp.spec_from_file_location(solution_file.stem, solution_file)
-      mod = imp.module_from_spec(spec)
-      spec.loader.exec_module(mod)
-      solutions[solution_file.stem] = [
-        obj() for (name, obj) in getmembers(mod, isclass)
-        if name.startswith(self.class_prefix)
-      ]
+    for (name, class_names) in MANIFEST.solutions(self.puzzle_dir).items():
+      solution_file = (self._solution_dir / name).resolve()
+      try:
+        mod = load_module(solution_file)
+        solutions[solution_file.stem] = [
+          getattr(mod, class_name)() for class_name in class_names
+          if class_name.startswith(self.class_prefix)
+        ]
+      except Exception:
+        self._errors[solution_file.stem] = format_exc()
 
     return solutions
 
+  @staticmethod
+  def _local_sources(solution_file: Path) -> set[Path] | None:
+
+    try:
+      return local_sources(solution_file)
+    except (SyntaxError, ValueError):
+      return None
+
+  def _to_str_elapsed(self, result):
+
+    text = str(result.elapsed)
+    if self.phases and result.load:
+      text = 'load {} parse {} solve {}'.format(
+        result.load, result.parse or f'{"stream":^16}', text
+      )
+    if len(result.elapsed.samples) > 1:
+      text += f' {result.elapsed.stats()}'
+    if result.memory:
+      text += f' | {result.memory}'
+    if result.cached:
+      text += ' (cached)'
+
+    return text
+
+  def to_str_matrix(self, baseline: str | None = None) -> str:
+
+    matrix = self.matrix(baseline)
+
+    header = ['']
+    header += matrix['solutions']
+    rows = [header]
+    for (input_name, row) in matrix['cells'].items():
+      cells = [input_name]
+      for key in matrix['solutions']:
+        if not (cell := row.get(key)):
+          cells.append('')
+          continue
+        result = next(
+          result for result in self._results[key]
+          if result.input_name == input_name
+        )
+        elapsed = result.elapsed.to_str(color=False)
+        if cell['speedup'] is None:
+          cells.append(
+            f'{elapsed} {"":>7}' if cell['correct']
+            else 'FAIL' if cell['state'] == State.OK.name
+            else cell['state']
+          )
+        else:
+          cells.append(f'{elapsed} {cell["speedup"]:>6.2f}x')
+      rows.append(cells)
+
+    widths = [max(len(row[col]) for row in rows) for col in range(len(header))]
+    lines = [f'========== matrix vs {matrix["baseline"]} ==========']
+    for (idx, row) in enumerate(rows):
+      lines.append(' | '.join(
+        f'{cell:>{width}}' if col == 0 else f'{cell:^{width}}'
+        for (col, (cell, width)) in enumerate(zip(row, widths))
+      ))
+      if idx == 0:
+        lines.append('-+-'.join(width * '-' for width in widths))
+    lines.append('')
+
+    return '\n'.join(lines)
+
+  def to_str_scaling(self, threshold: float = 0.25) -> str:
+
+    fits = self.scaling()
+    lines = [f'========== scaling {self.name} (time vs bytes) ==========']
+    if not fits:
+      lines += ['not enough scaling inputs (final.txt, N.txt, xN.txt)', '']
+      return '\n'.join(lines)
+
+    width = max(map(len, fits))
+    for (key, (exponent, coefficient, points)) in fits.items():
+      color = RED if exponent > 1 + threshold else GREEN
+      fmt = '{:>{}} | {}n^{:.2f}{} | t = {:.3e} s * n^{:.2f} ({} inputs){}'
+      lines.append(fmt.format(
+        key,
+        width,
+        color,
+        exponent,
+        RESET,
+        coefficient,
+        exponent,
+        points,
+        ' SUPER-LINEAR' if exponent > 1 + threshold else '',
+      ))
+    lines.append('')
+
+    return '\n'.join(lines)
+
   def _to_str_init(self):
 
     return super().__str__()
@@ -156,9 +887,11 @@ class PuzzleRunner:
     longest = [0, 0]
 
     for result in results:
-      row = [result.input_name, result.elapsed]
-      if isinstance(result.observed, str):
+      row = [result.input_name, self._to_str_elapsed(result)]
+      if result.state is State.ERROR:
         row += [RED, 'ERROR', 50 * '-', result.observed, 50 * '-', RESET]
+      elif result.state is not State.OK:
+        row += [RED, result.state.name, RESET]
       else:
         row += [
           GREEN if result.correct else RED,
@@ -180,7 +913,26 @@ class PuzzleRunner:
     fmt_prefix = '{:>%d} | {} | '
     fmt = (fmt_prefix + '{}{:^%d}{}') % longest
     err_fmt = (fmt_prefix + '{}{}\n{}\n{}\n{}{}') % (longest[0], )
-    lines += [(fmt if len(row) == 5 else err_fmt).format(*row) for row in rows]
+    for (row, result) in zip(rows, results):
+      lines.append((fmt if len(row) == 5 else err_fmt).format(*row))
+      if result.memory:
+        lines += [
+          '{:>{}} | {} {}'.format(
+            '', longest[0], Memory.to_str_bytes(size), site
+          )
+          for (site, size) in result.memory.top
+        ]
+      if result.profile:
+        lines += [
+          '{:>{}} | cum {} tot {} {}'.format(
+            '',
+            longest[0],
+            Duration([int(cumtime * Duration.NS)]).to_str(color=False),
+            Duration([int(tottime * Duration.NS)]).to_str(color=False),
+            func,
+          )
+          for (func, cumtime, tottime) in result.profile.top
+        ]
     lines.append('')
 
     return '\n'.join(lines)
@@ -194,6 +946,22 @@ class PuzzleRunner:
     return self._to_str_post()
 
 
+def generate_inputs(day_dir: Path, scale: int) -> list[Path]:
+
+  generator_file = day_dir / GENERATOR_FILE_NAME
+  if not generator_file.is_file():
+    warning(f'no generator for {day_dir.relative_to(BASE_DIR)}')
+    return []
+
+  mod = load_module(generator_file, day_dir)
+  (generator, ) = [
+    obj for (_, obj) in getmembers(mod, isclass)
+    if issubclass(obj, Generator) and obj is not Generator
+  ]
+
+  return generator()._generate(day_dir, scale)
+
+
 def puzzle_id(s):
 
   s = s.lower()
@@ -212,76 +980,207 @@ def puzzle_id(s):
   return (year, int(num), which)
 
 
+def puzzle_spec(s):
+
+  if len(s) == 4 and s.isdigit():
+    return (s, None, None)
+
+  year = None
+  if '/' in s:
+    (year, s) = s.split('/')
+
+  (first, _, last) = s.partition('-')
+  first = puzzle_id(first)[1:]
+  last = puzzle_id(last)[1:] if last else first
+
+  return (year, first, last)
+
+
 def warning(msg):
 
   print(f'{YELLOW}WARNING: {msg}{RESET}', file=sys.stderr)
 
 
-def get_args():
+def get_args(argv: list[str] | None = None):
 
   ap = ArgumentParser()
   add = ap.add_argument
 
-  add('puzzle', type=puzzle_id, help='[YEAR/]NUM{a,b} e.g. 1a, 2023/2b')
+  add(
+    'puzzle', type=puzzle_spec, nargs='*',
+    help='YEAR or [YEAR/]NUM{a,b}[-NUM{a,b}] e.g. 1a, 2023/2b, 2023/1a-5b',
+  )
 
+  add(
+    '-e', '--export', type=Path, metavar='FILE',
+    help='export the timing matrix to FILE (.json or .csv)',
+  )
+  add(
+    '-f', '--force', action='store_true',
+    help='re-run every pair even if a cached result is still valid',
+  )
+  add(
+    '-g', '--generate', type=int, action='append', metavar='SCALE',
+    help='write SCALE-times inputs with the day generator before running',
+  )
   add(
     '-i', '--input-file', type=Path,
     help='run the solutions against an additional input file',
   )
+  add(
+    '--no-input-cache', dest='input_cache', action='store_false',
+    help='always re-parse input files instead of using .cache/inputs',
+  )
+  add(
+    '--isolate', action='store_true',
+    help='run each (solution, input) pair in its own child process',
+  )
+  add(
+    '-j', '--jobs', type=int, default=1,
+    help='run (solution, input) pairs in N processes (0 for one per CPU)',
+  )
+  add(
+    '-m', '--matrix', nargs='?', const='', metavar='BASELINE',
+    help='print an input x solution timing matrix with speedups vs BASELINE',
+  )
+  add(
+    '--max-memory', type=int, metavar='MB',
+    help='cap the address space of isolated runs (implies --isolate)',
+  )
+  add(
+    '--memory', action='store_true',
+    help='trace peak and net allocations in an extra untimed run',
+  )
+  add(
+    '-P', '--phases', action='store_true',
+    help='report input load and per-line parse time next to solve time',
+  )
+  add(
+    '-p', '--pin-cpu', type=int, metavar='CPU',
+    help='pin the process to one CPU for steadier timings',
+  )
+  add(
+    '--profile', type=Path, nargs='?', const=Path('profile'), metavar='DIR',
+    help='cProfile an extra untimed run; write .pstats/.collapsed to DIR',
+  )
   add(
     '-q', '--quiet', action='store_true',
     help='suppress warnings',
   )
+  add(
+    '-r', '--repeat', type=int, default=1, metavar='N',
+    help='time N runs of each solution and report the distribution',
+  )
+  add(
+    '--no-result-cache', dest='result_cache', action='store_false',
+    help='neither replay nor store results in .cache/results',
+  )
+  add(
+    '--scaling', type=int, nargs='*', metavar='SCALE',
+    help='fit time vs size over final/N/xN inputs, generating xSCALE first',
+  )
+  add(
+    '--scaling-threshold', type=float, default=0.25, metavar='EXP',
+    help='flag fitted exponents above 1 + EXP (default 0.25)',
+  )
+  add(
+    '--serve', action='store_true',
+    help=f'keep modules warm for client.py on .cache/{SOCKET_PATH.name}',
+  )
   add(
     '-s', '--skip', action='append',
     help='skip file names (one name per -s)',
   )
+  add(
+    '--stream', action='store_true',
+    help='read input bodies lazily for solutions that support streaming',
+  )
+  add(
+    '-t', '--timeout', type=float, metavar='SEC',
+    help='kill isolated runs after SEC seconds (implies --isolate)',
+  )
   add(
     '-v', '--verbose', action='count', default=0,
     help='specify multiple times to increase verbosity',
   )
+  add(
+    '-W', '--watch', action='store_true',
+    help='keep running and re-run pairs affected by file changes',
+  )
+  add(
+    '-w', '--warmup', type=int, default=0, metavar='K',
+    help='run each solution K untimed times before measuring',
+  )
 
-  args = ap.parse_args()
+  args = ap.parse_args(argv)
 
-  (year, num, which) = args.puzzle
-  del args.puzzle
+  if args.repeat < 1:
+    ap.error(f'argument -r/--repeat: must be at least 1, got {args.repeat}')
+  if args.jobs < 0:
+    ap.error(f'argument -j/--jobs: must not be negative, got {args.jobs}')
 
-  if not year:
-    year = YEARS[-1]
-    if not args.quiet and (datetime.now().year - int(year)) >= 2:
-      warning(f'no year specified; using {year}\n')
-  year_dir = BASE_DIR / str(year)
-
-  if not year_dir.is_dir():
-    ap.error(f'no such year {year}; choices:\n    {", ".join(YEARS)}')
-
-  args.puzzle_dir = year_dir / f'day_{num:02d}' / which
-  if (
-    not args.puzzle_dir.is_dir()
-    or not len(list(args.puzzle_dir.iterdir()))
-  ):
-    solutions = sorted(
-      day.name.split('_', 1)[-1].strip('0') + which.stem
-      for day in year_dir.iterdir()
-      if day.name.startswith('day_')
-      for which in day.iterdir()
-      if which.is_dir() and len(list(which.iterdir()))
-    )
-    ap.error('no such puzzle {}{}; choices for {}:\n    {}'.format(
-      num, which, year, ', '.join(solutions)
+  if args.export and args.export.suffix not in EXPORT_SUFFIXES:
+    ap.error('unsupported export format {}; choices:\n    {}'.format(
+      args.export.suffix or args.export.name, ', '.join(EXPORT_SUFFIXES)
     ))
 
-  args.class_prefix = f'Day{num:02d}{which}'
+  if args.serve:
+    return args
+  if not args.puzzle:
+    ap.error('the following arguments are required: puzzle')
+
+  years = MANIFEST.years()
+  args.puzzles = []
+  for (year, first, last) in args.puzzle:
+
+    if not year:
+      year = years[-1]
+      if not args.quiet and (datetime.now().year - int(year)) >= 2:
+        warning(f'no year specified; using {year}\n')
+    year_dir = BASE_DIR / str(year)
+
+    if year not in years:
+      ap.error(f'no such year {year}; choices:\n    {", ".join(years)}')
+
+    available = MANIFEST.puzzles(year)
+    if first is None:
+      selected = available
+    else:
+      selected = [puzzle for puzzle in available if first <= puzzle <= last]
+
+    if first is None:
+      requested = year
+    else:
+      requested = '{}{}'.format(*first)
+      if last != first:
+        requested += '-{}{}'.format(*last)
+
+    if not selected or (first and first == last and first not in selected):
+      ap.error('no such puzzle {}; choices for {}:\n    {}'.format(
+        requested,
+        year,
+        ', '.join(f'{num}{which}' for (num, which) in available),
+      ))
+
+    args.puzzles += [
+      (year_dir / f'day_{num:02d}' / which, f'Day{num:02d}{which}')
+      for (num, which) in selected
+    ]
+
+  del args.puzzle
 
   return args
 
 
-YEARS = sorted(
-  path.name
-  for path in BASE_DIR.iterdir()
-  if len(path.name) == 4 and path.name.startswith('2') and path.name.isdigit()
-)
+EXPORT_SUFFIXES = ('.csv', '.json')
+GENERATOR_FILE_NAME = 'generator.py'
+
+MANIFEST = Manifest(BASE_DIR)
 
 
 if __name__ == '__main__':
-  main(**vars(get_args()))
+  args = get_args()
+  if args.__dict__.pop('serve'):
+    Server().run()
+  else:
+    main(**vars(args))